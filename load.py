@@ -10,19 +10,33 @@ except ImportError:
     import ttk
 
 import sys
+import os
 import re
+import time
+import json
+import random
+import hashlib
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from threading import Thread
+from threading import Thread, Lock
+
+try:
+    from html import unescape
+except ImportError:
+    from HTMLParser import HTMLParser
+    unescape = HTMLParser().unescape
 
 try:
     # Python 3
     from urllib.request import Request, urlopen
     from urllib.error import URLError, HTTPError
-    from urllib.parse import quote
+    from urllib.parse import quote, urlparse
 except ImportError:
     # Python 2
     from urllib2 import Request, urlopen, URLError, HTTPError
     from urllib import quote
+    from urlparse import urlparse
 
 this = sys.modules[__name__]
 
@@ -52,13 +66,966 @@ except ImportError:
 # Configuration keys
 CFG_CARRIER_NAME = "EDHaulerCarrierName"
 CFG_OVERLAY_ENABLED = "EDHaulerOverlayEnabled"
+CFG_FLEET_CARRIERS = "EDHaulerFleetCarriers"
+CFG_OVERLAY_X = "EDHaulerOverlayX"
+CFG_OVERLAY_Y = "EDHaulerOverlayY"
+CFG_OVERLAY_CHAR_WIDTH = "EDHaulerOverlayCharWidth"
+CFG_OVERLAY_LINE_HEIGHT = "EDHaulerOverlayLineHeight"
+CFG_OVERLAY_MAX_ROWS = "EDHaulerOverlayMaxRows"
+CFG_OVERLAY_PAGE_SECONDS = "EDHaulerOverlayPageSeconds"
+CFG_ALERT_RULES = "EDHaulerAlertRules"
+CFG_ALERT_WEBHOOK = "EDHaulerAlertWebhook"
 
 # INARA base URL
 INARA_BASE_URL = "https://inara.cz"
 
-# Overlay settings
+# Market page parser settings
+DIAGNOSTICS_DIR = "diagnostics"  # inside the plugin folder; saved pages for unreadable markups
+NO_PRICE = 99999999999  # data-order value INARA uses for subheader rows
+# Commodity link in any quoting, absolute or relative, e.g. href='https://inara.cz/elite/commodities/10'
+COMMODITY_LINK_PATTERN = re.compile(r'href=["\'][^"\']*/commodit\w*/(\d+)/?["\']', re.IGNORECASE)
+
+# Commodity reference-price cache settings
+COMMODITY_PRICE_TTL = 3600  # seconds a fetched reference price stays fresh
+COMMODITY_PRICE_MISS_TTL = 300  # seconds before retrying a commodity page that failed
+COMMODITY_PRICE_TTL_JITTER = 0.25  # +/- fraction of the TTL, so entries do not all expire together
+COMMODITY_CACHE_SIZE = 256  # max cached commodities (least recently used are evicted)
+COMMODITY_FETCH_WORKERS = 4  # concurrent commodity page requests per batch
+
+# Trips-remaining settings
+TRIP_REFRESH_MS = 5000  # local trips display refresh, independent of the INARA poll
+DEFAULT_TRIP_MINUTES = 10  # round-trip estimate until deliveries have been timed
+MAX_TRIP_MINUTES = 60  # longer gaps between deliveries are breaks, not trips
+TRIP_SAMPLES = 10  # deliveries kept for the rolling round-trip average
+
+# Market list settings
+MARKET_VISIBLE_ROWS = 10  # rows visible in the main window; the rest scroll
+MARKET_COLUMNS = (
+    # (column id, heading, width in pixels, anchor)
+    ("type", "Type", 45, tk.W),
+    ("commodity", "Commodity", 150, tk.W),
+    ("stock", "Stock", 70, tk.E),
+    ("price", "Price", 75, tk.E),
+    ("profit", "Profit/t", 70, tk.E),
+    ("haul", "Haul value", 100, tk.E),
+)
+
+# Alert settings
+ALERT_DEBOUNCE_SECONDS = 300  # minimum time between repeats of one rule for one order
+ALERT_HYSTERESIS = 0.1  # demand must climb 10% above a threshold before it can alert again
+ALERT_OVERLAY_SECONDS = 15  # how long an alert stays on the overlay
+ALERT_WEBHOOK_HOSTS = ("localhost", "127.0.0.1", "::1")  # webhooks stay on this machine
+
+# Overlay settings (defaults; all but the slot budget can be changed in preferences)
 OVERLAY_X = 50  # pixels from left
 OVERLAY_Y = 100  # pixels from top
+OVERLAY_CHAR_WIDTH = 8  # approximate pixels per character
+OVERLAY_LINE_HEIGHT = 20  # pixels per normal line (large lines get 4 more)
+OVERLAY_MAX_ROWS = 20  # lines per overlay page
+OVERLAY_PAGE_SECONDS = 10  # time each page is shown when a market needs several
+OVERLAY_MAX_SLOTS = 20  # EDMCOverlay message IDs reserved for the market box
+OVERLAY_TTL = 60  # seconds an overlay message stays up without being resent
+
+
+def config_int(key, default):
+    """Read an integer setting, falling back to the default if unset or invalid"""
+    try:
+        return int(config.get(key))
+    except (TypeError, ValueError):
+        return default
+
+
+def parse_carrier_list(text):
+    """Split a comma-separated carrier list, dropping blanks and duplicates"""
+    carriers = []
+    for name in (text or "").split(","):
+        name = name.strip()
+        if name and name not in carriers:
+            carriers.append(name)
+    return carriers
+
+
+class FleetIndex(object):
+    """
+    Aggregate buy-order demand across all tracked carriers.
+    
+    Each carrier contributes {commodity: (stock, price)}. When a carrier's
+    snapshot changes only the commodities that differ from its previous
+    contribution are touched, so a refresh where nothing moved costs one
+    dict comparison per carrier.
+    """
+    def __init__(self):
+        self.carriers = {}       # key -> {"label": str, "orders": {commodity: (stock, price)}}
+        self.demand = {}         # commodity -> {carrier key: (stock, price)}
+        self.totals = {}         # commodity -> total outstanding tons
+        self.best = {}           # commodity -> (price, carrier key)
+        self.carrier_value = {}  # carrier key -> (total value, total tons)
+
+    def update_carrier(self, key, snapshot):
+        """Apply a carrier snapshot and return the set of commodities that changed"""
+        if not snapshot or "error" in snapshot:
+            # Keep the last good contribution through transient fetch errors
+            return set()
+        
+        new_orders = {}
+        for order in snapshot.get("orders", []):
+            if order.get("orderType") == 1:
+                new_orders[order.get("commodityName", "Unknown")] = (order.get("stock", 0), order.get("price", 0))
+        
+        carrier_info = snapshot.get("carrier_info", {})
+        label = carrier_info.get("callsign") or carrier_info.get("name") or key
+        return self._apply(key, label, new_orders)
+
+    def remove_carrier(self, key):
+        """Drop a carrier that is no longer tracked"""
+        if key not in self.carriers:
+            return set()
+        changed = self._apply(key, key, {})
+        del self.carriers[key]
+        self.carrier_value.pop(key, None)
+        return changed
+
+    def _apply(self, key, label, new_orders):
+        """Diff a carrier's new orders against its previous contribution"""
+        old_orders = self.carriers.get(key, {}).get("orders", {})
+        changed = set()
+        
+        for commodity in set(old_orders) | set(new_orders):
+            old = old_orders.get(commodity)
+            new = new_orders.get(commodity)
+            if old == new:
+                continue
+            changed.add(commodity)
+            
+            bucket = self.demand.setdefault(commodity, {})
+            total = self.totals.get(commodity, 0)
+            if old:
+                total -= old[0]
+                del bucket[key]
+            if new:
+                total += new[0]
+                bucket[key] = new
+            
+            if not bucket:
+                del self.demand[commodity]
+                self.totals.pop(commodity, None)
+                self.best.pop(commodity, None)
+                continue
+            
+            self.totals[commodity] = total
+            # Buckets hold one entry per carrier, so rescanning one is cheap
+            best_key = max(bucket, key=lambda k: bucket[k][1])
+            self.best[commodity] = (bucket[best_key][1], best_key)
+        
+        self.carriers[key] = {"label": label, "orders": new_orders}
+        if changed or key not in self.carrier_value:
+            tons = sum(stock for stock, price in new_orders.values())
+            value = sum(stock * price for stock, price in new_orders.values())
+            self.carrier_value[key] = (value, tons)
+        return changed
+
+    def label(self, key):
+        """Display label (callsign or name) for a carrier key"""
+        return self.carriers.get(key, {}).get("label", key)
+
+    def commodity_summary(self):
+        """List of (commodity, total tons, best price, best carrier label), largest demand first"""
+        summary = []
+        for commodity, total in self.totals.items():
+            price, best_key = self.best[commodity]
+            summary.append((commodity, total, price, self.label(best_key)))
+        summary.sort(key=lambda row: (-row[1], row[0]))
+        return summary
+
+    def ranking(self):
+        """List of (carrier label, value per ton, total tons) for carriers with demand, best paying first"""
+        ranking = []
+        for key, (value, tons) in self.carrier_value.items():
+            if not tons:
+                continue  # No outstanding buy orders, nothing to pay for
+            ranking.append((self.label(key), value // tons, tons))
+        ranking.sort(key=lambda row: (-row[1], row[0]))
+        return ranking
+
+
+class CommodityPriceCache(object):
+    """
+    TTL + LRU cache of INARA commodity reference prices.
+    
+    Prices come from /elite/commodity/<id>/ pages. Missing or expired IDs
+    are fetched together in one concurrent batch; once warm a refresh makes
+    no extra requests until entries expire. Expiry times are jittered so a
+    warm cache goes stale a few entries at a time rather than all at once.
+    """
+    def __init__(self, ttl=COMMODITY_PRICE_TTL, miss_ttl=COMMODITY_PRICE_MISS_TTL,
+                 max_entries=COMMODITY_CACHE_SIZE, workers=COMMODITY_FETCH_WORKERS):
+        self.ttl = ttl
+        self.miss_ttl = miss_ttl
+        self.max_entries = max_entries
+        self.workers = workers
+        self.entries = OrderedDict()  # commodity id -> (expires_at, prices or None)
+        self.lock = Lock()
+
+    def get(self, commodity_id, now=None):
+        """Return cached prices for a commodity, or None if missing or expired"""
+        now = time.time() if now is None else now
+        with self.lock:
+            entry = self.entries.get(commodity_id)
+            if entry is None or entry[0] <= now:
+                return None
+            self.entries.move_to_end(commodity_id)
+            return entry[1] or {}
+
+    def put(self, commodity_id, prices, now=None):
+        """Store prices (None records a failed lookup with the shorter TTL)"""
+        now = time.time() if now is None else now
+        ttl = self.ttl if prices else self.miss_ttl
+        ttl *= 1 + random.uniform(-COMMODITY_PRICE_TTL_JITTER, COMMODITY_PRICE_TTL_JITTER)
+        with self.lock:
+            self.entries[commodity_id] = (now + ttl, prices)
+            self.entries.move_to_end(commodity_id)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+
+    def lookup(self, commodity_ids):
+        """Return ({id: prices} from the cache, [IDs missing or expired]) without any requests"""
+        results = {}
+        missing = []
+        for commodity_id in set(commodity_ids):
+            prices = self.get(commodity_id)
+            if prices is None:
+                missing.append(commodity_id)
+            elif prices:
+                results[commodity_id] = prices
+        return results, missing
+
+    def get_many(self, commodity_ids):
+        """Return {id: prices} for all IDs, fetching the cold ones concurrently"""
+        results, missing = self.lookup(commodity_ids)
+        if missing:
+            with ThreadPoolExecutor(max_workers=min(self.workers, len(missing))) as executor:
+                for commodity_id, prices in zip(missing, executor.map(self.fetch_prices, missing)):
+                    self.put(commodity_id, prices)
+                    if prices:
+                        results[commodity_id] = prices
+        return results
+
+    def fetch_prices(self, commodity_id):
+        """Fetch average buy/sell prices from an INARA commodity page"""
+        try:
+            request = Request(
+                f"{INARA_BASE_URL}/elite/commodity/{commodity_id}/",
+                headers={'User-Agent': 'EDHauler/1.0 (EDMC Plugin)'}
+            )
+            response = urlopen(request, timeout=15)
+            html = response.read().decode('utf-8')
+            
+            # Page shows e.g. "Avg sell price</span><span>52,341 Cr" right after each label.
+            # Only tags and whitespace may sit between label and number; a "-" means no price.
+            prices = {}
+            for side in ("sell", "buy"):
+                match = re.search(
+                    r'Avg\.?\s*' + side + r'\s*price\s*:?\s*(?:<[^>]*>\s*)*(\d[\d,]*)\s*Cr',
+                    html, re.IGNORECASE
+                )
+                if match:
+                    prices[side] = int(match.group(1).replace(",", ""))
+            return prices or None
+        except Exception as e:
+            print(f"EDHauler: Could not fetch commodity {commodity_id}: {e}")
+            return None
+
+
+def annotate_orders(snapshot, reference_prices):
+    """Add profit-per-ton and haul-value columns to a snapshot's orders"""
+    if not snapshot or "error" in snapshot:
+        return
+    
+    for order in snapshot.get("orders", []):
+        price = order.get("price", 0)
+        order["haulValue"] = order.get("stock", 0) * price
+        
+        reference = reference_prices.get(order.get("commodityId"), {})
+        if order.get("orderType") == 1 and "buy" in reference:
+            # Carrier buys: hauler buys at the station, sells to the carrier
+            order["profitPerTon"] = price - reference["buy"]
+        elif order.get("orderType") == 2 and "sell" in reference:
+            # Carrier sells: hauler buys from the carrier, sells at a station
+            order["profitPerTon"] = reference["sell"] - price
+
+
+def market_commodity_ids(snapshot):
+    """INARA commodity IDs of a snapshot's orders"""
+    if not snapshot or "error" in snapshot:
+        return []
+    return [order["commodityId"] for order in snapshot.get("orders", []) if order.get("commodityId")]
+
+
+def format_order_columns(order):
+    """Profit-per-ton and haul-value columns for fixed-width tables"""
+    profit = order.get("profitPerTon")
+    profit_text = f"{profit:>+9,}/t" if profit is not None else f"{'-':>9}/t"
+    return f" | {profit_text} | {order.get('haulValue', 0):>14,} CR"
+
+
+def normalize_commodity(name):
+    """Comparable commodity key for INARA names and journal symbols"""
+    return re.sub(r'[^a-z0-9]', '', (name or "").lower())
+
+
+def format_duration(minutes):
+    """Format minutes as e.g. '1h 05m' or '25m'"""
+    minutes = int(round(minutes))
+    if minutes >= 60:
+        return f"{minutes // 60}h {minutes % 60:02d}m"
+    return f"{minutes}m"
+
+
+class CargoTracker(object):
+    """
+    Ship cargo state from journal events, used to estimate trips remaining.
+    
+    Loadout gives the cargo capacity, Cargo gives what is in the hold and
+    MarketSell while docked at a fleet carrier times each delivery. Estimates
+    are memoized per buy order and only recomputed when the order's stock or
+    the cargo state (tracked by a generation counter) changes.
+    """
+    def __init__(self):
+        self.capacity = 0
+        self.cargo = {}  # normalized commodity -> tons in hold
+        self.symbol_names = {}  # journal symbol -> normalized localised (INARA-style) name
+        self.docked_at_carrier = False
+        self.deliveries = deque(maxlen=TRIP_SAMPLES)  # delivery timestamps
+        self.generation = 0
+        self.estimates = {}  # normalized commodity -> (stock, generation, estimate)
+
+    def on_journal_entry(self, entry, state=None):
+        """Apply a journal event; returns True if estimates may have changed"""
+        event = entry.get("event")
+        
+        if event == "Loadout":
+            capacity = entry.get("CargoCapacity", 0)
+            if capacity == self.capacity:
+                return False
+            self.capacity = capacity
+        
+        elif event == "Cargo":
+            if entry.get("Vessel", "Ship") != "Ship":
+                return False
+            if "Inventory" in entry:
+                cargo = {}
+                for item in entry["Inventory"]:
+                    key = self.commodity_key(item.get("Name"), item.get("Name_Localised"))
+                    cargo[key] = cargo.get(key, 0) + item.get("Count", 0)
+            elif state and state.get("Cargo") is not None:
+                # Inventory lives in Cargo.json; EDMC has already read it into state (symbols only)
+                cargo = {}
+                for name, count in state["Cargo"].items():
+                    key = self.commodity_key(name)
+                    cargo[key] = cargo.get(key, 0) + count
+            else:
+                return False
+            if cargo == self.cargo:
+                return False
+            self.cargo = cargo
+        
+        elif event == "Docked":
+            self.docked_at_carrier = entry.get("StationType") == "FleetCarrier"
+            return False
+        
+        elif event == "Location":
+            # Written at game start; carries Docked/StationType when the session starts docked
+            self.docked_at_carrier = bool(entry.get("Docked")) and entry.get("StationType") == "FleetCarrier"
+            return False
+        
+        elif event == "Undocked":
+            self.docked_at_carrier = False
+            return False
+        
+        elif event == "MarketSell":
+            self.commodity_key(entry.get("Type"), entry.get("Type_Localised"))
+            if not self.docked_at_carrier:
+                return False
+            try:
+                timestamp = datetime.strptime(entry.get("timestamp", ""), "%Y-%m-%dT%H:%M:%SZ")
+            except ValueError:
+                return False
+            if self.deliveries and self.deliveries[-1] == timestamp:
+                return False
+            self.deliveries.append(timestamp)
+        
+        else:
+            return False
+        
+        self.generation += 1
+        return True
+
+    def commodity_key(self, symbol, localised=None):
+        """
+        Match journal commodities to INARA display names.
+        
+        Journal symbols can differ from display names ("lowtemperaturediamond"
+        vs "Low Temperature Diamonds"), so the localised name is used when the
+        journal gives one and remembered for events that only carry the symbol.
+        """
+        symbol = normalize_commodity(symbol)
+        if localised:
+            self.symbol_names[symbol] = normalize_commodity(localised)
+        return self.symbol_names.get(symbol, symbol)
+
+    def trip_minutes(self):
+        """Average round trip from timed deliveries, or the default estimate"""
+        gaps = []
+        previous = None
+        for timestamp in self.deliveries:
+            if previous is not None:
+                minutes = (timestamp - previous).total_seconds() / 60
+                # Several sales in one dock count as one delivery
+                if 1 <= minutes <= MAX_TRIP_MINUTES:
+                    gaps.append(minutes)
+            previous = timestamp
+        return sum(gaps) / len(gaps) if gaps else DEFAULT_TRIP_MINUTES
+
+    def estimate(self, order):
+        """Return (trips, minutes) left to fill a buy order, or None without a known capacity"""
+        if not self.capacity:
+            return None
+        
+        key = normalize_commodity(order.get("commodityName"))
+        stock = order.get("stock", 0)
+        cached = self.estimates.get(key)
+        if cached and cached[0] == stock and cached[1] == self.generation:
+            return cached[2]
+        
+        carried = min(self.cargo.get(key, 0), stock)
+        remaining = stock - carried
+        trips = (1 if carried else 0) + (remaining + self.capacity - 1) // self.capacity
+        result = (trips, trips * self.trip_minutes())
+        self.estimates[key] = (stock, self.generation, result)
+        return result
+
+
+class MarketIndex(object):
+    """
+    Sortable, filterable index over one market snapshot.
+    
+    Display values and sort keys are computed once per snapshot and each
+    sorted order is cached per column, so re-sorting or typing in the filter
+    never touches the raw orders again.
+    """
+    SORT_KEYS = {
+        "type": lambda row: (row["kind"] != "BUY", row["name"]),
+        "commodity": lambda row: row["name"],
+        "stock": lambda row: row["order"].get("stock", 0),
+        "price": lambda row: row["order"].get("price", 0),
+        "profit": lambda row: (row["order"].get("profitPerTon") is not None, row["order"].get("profitPerTon") or 0),
+        "haul": lambda row: row["order"].get("haulValue", 0),
+    }
+
+    def __init__(self, orders):
+        self.rows = []
+        self.sorted_rows = {}  # column -> rows in ascending order
+        seen = set()
+        for order in orders:
+            kind = "BUY" if order.get("orderType") == 1 else "SELL"
+            commodity = order.get("commodityName", "Unknown")
+            iid = f"{kind}:{commodity}"
+            while iid in seen:
+                iid += "'"
+            seen.add(iid)
+            
+            profit = order.get("profitPerTon")
+            self.rows.append({
+                "iid": iid,
+                "kind": kind,
+                "name": commodity.lower(),
+                "search": f"{kind} {commodity}".lower(),
+                "order": order,
+                "values": (
+                    kind,
+                    commodity,
+                    f"{order.get('stock', 0):,}",
+                    f"{order.get('price', 0):,}",
+                    f"{profit:+,}" if profit is not None else "-",
+                    f"{order.get('haulValue', 0):,}",
+                ),
+            })
+
+    def view(self, column="type", descending=False, text=""):
+        """Rows sorted by a column and filtered by commodity/type text"""
+        rows = self.sorted_rows.get(column)
+        if rows is None:
+            rows = sorted(self.rows, key=self.SORT_KEYS[column])
+            self.sorted_rows[column] = rows
+        if descending:
+            rows = rows[::-1]
+        
+        text = text.strip().lower()
+        if text:
+            rows = [row for row in rows if text in row["search"]]
+        return rows
+
+
+class OverlayLayout(object):
+    """
+    Split overlay lines into pages that fit the slot budget.
+    
+    Every page repeats the carrier header; a section that does not fit
+    continues on the next page under a "(cont.)" title. Each page carries
+    the position of every slot and its background box, so rotating pages
+    only needs to compare and send slots.
+    """
+    def __init__(self, x=OVERLAY_X, y=OVERLAY_Y, char_width=OVERLAY_CHAR_WIDTH,
+                 line_height=OVERLAY_LINE_HEIGHT, max_rows=OVERLAY_MAX_ROWS):
+        self.x = x
+        self.y = y
+        self.char_width = max(char_width, 1)
+        self.line_height = max(line_height, 1)
+        # Room for the header, a section title and at least one row
+        self.max_rows = max(4, min(max_rows, OVERLAY_MAX_SLOTS))
+
+    def paginate(self, header, sections):
+        """
+        Build pages from header lines [(text, size)] and sections [(title, [text])]
+        """
+        body_rows = self.max_rows - len(header)
+        bodies = []
+        current = []
+        
+        for title, rows in sections:
+            remaining = list(rows)
+            continued = False
+            while remaining:
+                # Start a new page unless a blank, the title and one row still fit
+                if current and len(current) + 3 > body_rows:
+                    bodies.append(current)
+                    current = []
+                elif current:
+                    current.append(("", "normal"))
+                current.append((f"{title} (cont.):" if continued else f"{title}:", "large"))
+                space = body_rows - len(current)
+                current.extend((text, "normal") for text in remaining[:space])
+                remaining = remaining[space:]
+                if remaining:
+                    bodies.append(current)
+                    current = []
+                    continued = True
+        
+        if current or not bodies:
+            bodies.append(current)
+        
+        pages = []
+        for number, body in enumerate(bodies, 1):
+            lines = list(header)
+            if len(bodies) > 1 and lines:
+                lines[0] = (f"{lines[0][0]} [{number}/{len(bodies)}]", lines[0][1])
+            pages.append(self.place(lines + body))
+        return pages
+
+    def place(self, lines):
+        """Position one page's lines and size its background box"""
+        slots = []
+        y_offset = self.y
+        for text, size in lines:
+            slots.append((text, size, self.x, y_offset))
+            y_offset += self.line_height + 4 if size == "large" else self.line_height
+        
+        max_line_length = max(len(text) for text, size in lines) if lines else 0
+        box_width = max(max_line_length * self.char_width, 300)  # Minimum 300px width
+        box_height = y_offset - self.y + 20  # Lines + padding
+        return {"slots": slots, "box": (self.x - 10, self.y - 10, box_width, box_height)}
+
+
+def strip_tags(fragment):
+    """Visible text of an HTML fragment"""
+    return " ".join(unescape(re.sub(r'<[^>]+>', ' ', fragment)).split())
+
+
+def parse_market_rows(html):
+    """
+    Fast path: one regex over INARA's current market table markup.
+    
+    Returns (commodity id, name, sell price, demand, buy price, supply) rows.
+    """
+    # INARA market table structure:
+    # Column 1: Commodity name
+    # Column 2: Sell price (station buying FROM players) - if not "-" it's a BUY order
+    # Column 3: Demand (quantity for buy orders)
+    # Column 4: Buy price (station selling TO players) - if not "-" it's a SELL order
+    # Column 5: Supply (quantity for sell orders)
+    
+    # Find all table rows with commodity data
+    # Pattern matches: commodity link, then captures all 4 price/quantity columns
+    row_pattern = r'<tr[^>]*>.*?href="/elite/commodity/(\d+)/">([^<]+)</a>.*?' + \
+                 r'<td[^>]*data-order="(\d+)"[^>]*>.*?</td>.*?' + \
+                 r'<td[^>]*data-order="(\d+)"[^>]*>.*?</td>.*?' + \
+                 r'<td[^>]*data-order="(\d+)"[^>]*>.*?</td>.*?' + \
+                 r'<td[^>]*data-order="(\d+)"[^>]*>.*?</td>.*?</tr>'
+    
+    rows = []
+    for match in re.findall(row_pattern, html, re.DOTALL | re.IGNORECASE):
+        rows.append((match[0], match[1].strip(), int(match[2]), int(match[3]), int(match[4]), int(match[5])))
+    return rows
+
+
+def detect_market_columns(headers):
+    """Map header texts to market column indexes, or None if any is missing"""
+    columns = {}
+    for index, header in enumerate(headers):
+        header = header.lower()
+        if "demand" in header:
+            columns.setdefault("demand", index)
+        elif "supply" in header:
+            columns.setdefault("supply", index)
+        elif "sell" in header:
+            columns.setdefault("sell", index)
+        elif "buy" in header:
+            columns.setdefault("buy", index)
+    if len(columns) < 4:
+        return None
+    return columns
+
+
+def extract_market_rows_tolerant(html):
+    """
+    Slow path: find the commodity table and locate columns by header text.
+    
+    Survives reordered or added columns, changed attributes and missing
+    data-order values; returns rows in the same shape as parse_market_rows.
+    """
+    for table in re.findall(r'<table[^>]*>(.*?)</table>', html, re.DOTALL | re.IGNORECASE):
+        if not COMMODITY_LINK_PATTERN.search(table):
+            continue
+        headers = [strip_tags(h) for h in re.findall(r'<th[^>]*>(.*?)</th>', table, re.DOTALL | re.IGNORECASE)]
+        columns = detect_market_columns(headers)
+        if columns is None:
+            continue
+        
+        rows = []
+        for row in re.findall(r'<tr[^>]*>(.*?)</tr>', table, re.DOTALL | re.IGNORECASE):
+            link = re.search(COMMODITY_LINK_PATTERN.pattern + r'[^>]*>(.*?)</a>', row, re.DOTALL | re.IGNORECASE)
+            cells = re.findall(r'<td([^>]*)>(.*?)</td>', row, re.DOTALL | re.IGNORECASE)
+            if not link or len(cells) <= max(columns.values()):
+                continue
+            
+            def number(column):
+                attributes, content = cells[columns[column]]
+                order_match = re.search(r'data-order="(\d+)"', attributes)
+                if order_match:
+                    return int(order_match.group(1))
+                digits = re.sub(r'[^\d]', '', strip_tags(content))  # "-" or empty means none
+                return int(digits) if digits else 0
+            
+            rows.append((link.group(1), strip_tags(link.group(2)),
+                         number("sell"), number("demand"), number("buy"), number("supply")))
+        if rows:
+            return rows
+    return []
+
+
+def page_headers(html):
+    """Table header texts of a page, in order"""
+    return [strip_tags(h) for h in re.findall(r'<th[^>]*>(.*?)</th>', html, re.DOTALL | re.IGNORECASE)]
+
+
+def page_fingerprint(html, headers=None):
+    """Structural fingerprint of a market page: header texts and the tag shape of the first commodity row"""
+    if headers is None:
+        headers = page_headers(html)
+    
+    row_shape = ""
+    link_match = COMMODITY_LINK_PATTERN.search(html)
+    link = link_match.start() if link_match else -1
+    if link != -1:
+        row_start = html.rfind("<tr", 0, link)
+        row_end = html.find("</tr>", link)
+        if row_start != -1 and row_end != -1:
+            row = html[row_start:row_end]
+            row_shape = " ".join(re.findall(r'<(/?\w+)', row)) + f" data-order={row.count('data-order=')}"
+    
+    signature = "|".join(headers) + "#" + row_shape
+    return hashlib.sha1(signature.encode("utf-8")).hexdigest()[:12]
+
+
+def orders_from_rows(rows):
+    """Turn parsed market rows into buy and sell orders"""
+    orders = []
+    for commodity_id, commodity_name, sell_price, demand, buy_price, supply in rows:
+        # If sell_price > 0 and not NO_PRICE (that's the subheader), it's a BUY order
+        if sell_price > 0 and sell_price < NO_PRICE and demand > 0:
+            orders.append({
+                "commodityName": commodity_name,
+                "commodityId": commodity_id,  # INARA commodity ID (for reference prices)
+                "orderType": 1,  # Buy order (carrier buying from players)
+                "stock": demand,
+                "price": sell_price
+            })
+        
+        # If buy_price > 0 and not NO_PRICE, it's a SELL order
+        if buy_price > 0 and buy_price < NO_PRICE and supply > 0:
+            orders.append({
+                "commodityName": commodity_name,
+                "commodityId": commodity_id,
+                "orderType": 2,  # Sell order (carrier selling to players)
+                "stock": supply,
+                "price": buy_price
+            })
+    return orders
+
+
+class MarketParser(object):
+    """
+    Layered market page extraction with structural drift detection.
+    
+    The fast regex parser handles every refresh while the page keeps the
+    structure it last parsed with. A page without any commodity link whose
+    table headers match that layout is an empty market. Any other page the
+    fast parser cannot read counts as drift: the tolerant extractor runs, the fingerprint and page are written to the
+    diagnostics folder, and the outcome is remembered for that fingerprint
+    so later refreshes skip the failing fast path.
+    """
+    def __init__(self, diagnostics_dir=None):
+        self.diagnostics_dir = diagnostics_dir
+        self.known_good = None  # fingerprint the fast parser last succeeded on
+        self.known_good_headers = None  # table headers of that page (an empty market has no rows to fingerprint)
+        self.extractors = {}  # fingerprint -> "fallback" or "failed"
+
+    def parse(self, html, carrier_name=""):
+        """
+        Return (rows, status, saved page path or None).
+        
+        Status is ok, empty, fallback or failed; a page path is only returned
+        by the call that wrote it to the diagnostics folder.
+        """
+        known_good = self.known_good
+        fingerprint = page_fingerprint(html) if self.extractors else None
+        if fingerprint and self.extractors.get(fingerprint) == "fallback":
+            # Structure already known to need the tolerant extractor
+            return extract_market_rows_tolerant(html), "fallback", None
+        
+        rows = parse_market_rows(html)
+        headers = page_headers(html)
+        if rows:
+            self.known_good = fingerprint or page_fingerprint(html, headers)
+            self.known_good_headers = headers
+            self.extractors.pop(self.known_good, None)
+            return rows, "ok", None
+        
+        if not COMMODITY_LINK_PATTERN.search(html):
+            # No commodity rows at all: an empty market if the table itself still
+            # looks like the last good layout (or, before any, like a market table)
+            if self.known_good_headers is not None:
+                if headers == self.known_good_headers:
+                    return [], "empty", None
+            elif detect_market_columns(headers) is not None:
+                return [], "empty", None
+        
+        fingerprint = fingerprint or page_fingerprint(html, headers)
+        if self.extractors.get(fingerprint) == "failed":
+            # Already reported; do not rescan or resave the same broken layout
+            return [], "failed", None
+        
+        rows = extract_market_rows_tolerant(html)
+        status = "fallback" if rows else "failed"
+        self.extractors[fingerprint] = status
+        saved_page = self.record_drift(html, fingerprint, known_good, status, carrier_name, len(rows))
+        return rows, status, saved_page
+
+    def record_drift(self, html, fingerprint, known_good, status, carrier_name, row_count):
+        """Save the page and a fingerprint log entry to the diagnostics folder; returns the page path if written"""
+        print(f"EDHauler: INARA market layout changed ({known_good} -> {fingerprint}), fallback parser {status} with {row_count} rows")
+        if not self.diagnostics_dir:
+            return None
+        
+        try:
+            if not os.path.isdir(self.diagnostics_dir):
+                os.makedirs(self.diagnostics_dir)
+            timestamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+            page_path = os.path.join(self.diagnostics_dir, f"market-{timestamp}-{fingerprint}.html")
+            with open(page_path, "w", encoding="utf-8") as page_file:
+                page_file.write(html)
+            with open(os.path.join(self.diagnostics_dir, "fingerprints.log"), "a", encoding="utf-8") as log_file:
+                log_file.write(f"{timestamp}\t{carrier_name}\t{known_good} -> {fingerprint}\t{status}\t{row_count} rows\t{os.path.basename(page_path)}\n")
+            return page_path
+        except Exception as e:
+            print(f"EDHauler: Could not write parser diagnostics: {e}")
+            return None
+
+
+class AlertRule(object):
+    """
+    One compiled alert rule.
+    
+    Rules are separated by ";" in preferences:
+    - "demand tritium < 1000": a buy order's demand drops below 1,000 t
+    - "new buy" or "new sell gold": a new order appears
+    - "price * 5%": a price moves more than 5% ("*" matches any commodity)
+    """
+    PATTERNS = (
+        ("demand", re.compile(r'^demand\s+(.+?)\s*<\s*([\d,]+)$', re.IGNORECASE)),
+        ("new", re.compile(r'^new\s+(buy|sell)(?:\s+(.+))?$', re.IGNORECASE)),
+        ("price", re.compile(r'^price\s+(.+?)\s+([\d.]+)\s*%$', re.IGNORECASE)),
+    )
+
+    def __init__(self, text, kind, commodity, threshold=0, order_type=None):
+        self.text = text
+        self.kind = kind
+        self.commodity = commodity  # normalized, or "*" for any
+        self.threshold = threshold
+        self.order_type = order_type
+
+    @classmethod
+    def parse(cls, text):
+        """Compile rule text, raising ValueError if it matches no rule form"""
+        text = " ".join(text.split())
+        for kind, pattern in cls.PATTERNS:
+            match = pattern.match(text)
+            if not match:
+                continue
+            if kind == "demand":
+                return cls(text, kind, cls.commodity_key(match.group(1)), int(match.group(2).replace(",", "")), 1)
+            if kind == "new":
+                order_type = 1 if match.group(1).lower() == "buy" else 2
+                return cls(text, kind, cls.commodity_key(match.group(2) or "*"), order_type=order_type)
+            return cls(text, kind, cls.commodity_key(match.group(1)), float(match.group(2)))
+        raise ValueError(f"Unknown alert rule: '{text}'")
+
+    @staticmethod
+    def commodity_key(name):
+        """Wildcards stay "*", names are normalized like journal and INARA names"""
+        name = name.strip()
+        return "*" if name.lower() in ("*", "any") else normalize_commodity(name)
+
+
+class AlertEngine(object):
+    """
+    Evaluate alert rules against snapshot changes.
+    
+    Rules are indexed by commodity, and each refresh is diffed against the
+    carrier's previous snapshot, so only rules for rows that changed are
+    checked. Demand alerts re-arm only after demand climbs back above the
+    threshold plus ALERT_HYSTERESIS, and every rule/order pair is debounced.
+    """
+    def __init__(self, rules_text=""):
+        self.previous = {}  # carrier key -> {(order type, commodity): order}
+        self.compile(rules_text)
+
+    def compile(self, rules_text):
+        """Parse ";"-separated rules and rebuild the commodity index"""
+        self.rules_text = rules_text or ""  # as typed, including rules that did not compile
+        self.rules = []
+        self.errors = []
+        self.index = {}  # normalized commodity -> [rule]
+        self.wildcard = []
+        self.armed = {}  # (rule, carrier, order key) -> demand alert armed
+        self.baseline = {}  # (rule, carrier, order key) -> price at last alert
+        self.last_fired = {}  # (rule, carrier, order key) -> time
+        
+        for text in (rules_text or "").split(";"):
+            if not text.strip():
+                continue
+            try:
+                rule = AlertRule.parse(text)
+            except ValueError as e:
+                print(f"EDHauler: {e}")
+                self.errors.append(str(e))
+                continue
+            self.rules.append(rule)
+            if rule.commodity == "*":
+                self.wildcard.append(rule)
+            else:
+                self.index.setdefault(rule.commodity, []).append(rule)
+        
+        # Rule state starts from the snapshots already seen, not from empty markets
+        for key, current in self.previous.items():
+            self.prime(key, current)
+
+    def forget(self, key):
+        """Drop a carrier that is no longer tracked"""
+        self.previous.pop(key, None)
+
+    def rules_for(self, commodity):
+        """Rules that apply to one commodity"""
+        return self.index.get(commodity, []) + self.wildcard
+
+    def prime(self, key, current):
+        """Arm demand rules from a first snapshot without alerting"""
+        for order_key, order in current.items():
+            for rule in self.rules_for(order_key[1]):
+                if rule.kind == "demand" and order_key[0] == 1:
+                    self.armed[(rule, key, order_key)] = order.get("stock", 0) >= rule.threshold
+
+    def evaluate(self, key, label, snapshot, now=None):
+        """Return alert messages for what changed in a carrier's snapshot"""
+        if not snapshot or "error" in snapshot:
+            return []
+        
+        current = {}
+        for order in snapshot.get("orders", []):
+            current[(order.get("orderType"), normalize_commodity(order.get("commodityName")))] = order
+        previous = self.previous.get(key)
+        self.previous[key] = current
+        
+        if previous is None:
+            self.prime(key, current)
+            return []
+        if not self.rules:
+            return []
+        
+        now = time.time() if now is None else now
+        alerts = []
+        for order_key in set(previous) | set(current):
+            old = previous.get(order_key)
+            new = current.get(order_key)
+            if old and new and old.get("stock") == new.get("stock") and old.get("price") == new.get("price"):
+                continue
+            for rule in self.rules_for(order_key[1]):
+                message = self.check(rule, key, label, order_key, old, new, now)
+                if message:
+                    alerts.append(message)
+        return alerts
+
+    def check(self, rule, key, label, order_key, old, new, now):
+        """Apply one rule to one changed order; returns a message or None"""
+        order_type = order_key[0]
+        name = (new or old).get("commodityName", "Unknown")
+        state_key = (rule, key, order_key)
+        
+        if rule.kind == "demand":
+            if order_type != 1:
+                return None
+            stock = new.get("stock", 0) if new else 0  # A vanished buy order has been filled
+            if stock >= rule.threshold * (1 + ALERT_HYSTERESIS):
+                self.armed[state_key] = True
+            elif stock < rule.threshold and self.armed.get(state_key, True):
+                message = f"{name} demand {stock:,} t below {rule.threshold:,} on {label}"
+                if self.fire(state_key, now):
+                    self.armed[state_key] = False
+                    return message
+            return None
+        
+        if rule.kind == "new":
+            if old is None and new and order_type == rule.order_type and self.fire(state_key, now):
+                kind = "BUY" if order_type == 1 else "SELL"
+                return f"New {kind} order: {name} {new.get('stock', 0):,} @ {new.get('price', 0):,} CR on {label}"
+            return None
+        
+        if rule.kind == "price" and old and new:
+            baseline = self.baseline.setdefault(state_key, old.get("price", 0))
+            price = new.get("price", 0)
+            if baseline and abs(price - baseline) * 100.0 / baseline > rule.threshold and self.fire(state_key, now):
+                self.baseline[state_key] = price
+                return f"{name} price {baseline:,} -> {price:,} CR ({(price - baseline) * 100.0 / baseline:+.1f}%) on {label}"
+        return None
+
+    def fire(self, state_key, now):
+        """Debounce: allow an alert unless this rule fired for this order recently"""
+        last = self.last_fired.get(state_key)
+        if last is not None and now - last < ALERT_DEBOUNCE_SECONDS:
+            return False
+        self.last_fired[state_key] = now
+        return True
+
 
 class EDHauler(object):
     """
@@ -73,6 +1040,24 @@ class EDHauler(object):
         self.is_fetching = False
         self.overlay_enabled = False
         self.overlay_client = None
+        self.fleet_carriers = []
+        self.fleet_index = FleetIndex()
+        self.price_cache = CommodityPriceCache()
+        self.is_pricing = False
+        self.cargo_tracker = CargoTracker()
+        self.market_parser = MarketParser()
+        self.alert_engine = AlertEngine()
+        self.alert_webhook = ""
+        self.trips_timer = None
+        self.trips_key = None  # cargo generation last shown (None forces a redraw)
+        self.trips_text = []
+        self.overlay_layout = OverlayLayout()
+        self.overlay_page_seconds = OVERLAY_PAGE_SECONDS
+        self.overlay_pages = []
+        self.overlay_pages_source = None  # snapshot the page cache was built from
+        self.overlay_page = 0
+        self.overlay_page_timer = None
+        self.overlay_sent = {}  # overlay ID -> (payload, sent at)
         
         # UI widgets
         self.carrier_label = None
@@ -82,6 +1067,15 @@ class EDHauler(object):
         self.refresh_button = None
         self.overlay_button = None
         self.market_labels = []
+        self.fleet_frame = None
+        self.fleet_labels = []
+        self.trips_label = None
+        self.market_view = None
+        self.market_tree = None
+        self.market_filter_var = None
+        self.market_rendered = {}  # tree iid -> values currently shown
+        self.market_index = MarketIndex([])
+        self.market_sort = ("type", False)  # (column, descending)
         
         # Initialize overlay if available
         if OVERLAY_AVAILABLE:
@@ -95,11 +1089,75 @@ class EDHauler(object):
         """Load saved configuration"""
         self.carrier_name = config.get(CFG_CARRIER_NAME) or ""
         self.overlay_enabled = config.get_bool(CFG_OVERLAY_ENABLED) or False
+        self.fleet_carriers = parse_carrier_list(config.get(CFG_FLEET_CARRIERS))
+        self.alert_engine.compile(config.get(CFG_ALERT_RULES) or "")
+        self.alert_webhook = config.get(CFG_ALERT_WEBHOOK) or ""
+        self.overlay_layout = OverlayLayout(
+            x=config_int(CFG_OVERLAY_X, OVERLAY_X),
+            y=config_int(CFG_OVERLAY_Y, OVERLAY_Y),
+            char_width=config_int(CFG_OVERLAY_CHAR_WIDTH, OVERLAY_CHAR_WIDTH),
+            line_height=config_int(CFG_OVERLAY_LINE_HEIGHT, OVERLAY_LINE_HEIGHT),
+            max_rows=config_int(CFG_OVERLAY_MAX_ROWS, OVERLAY_MAX_ROWS)
+        )
+        self.overlay_page_seconds = max(config_int(CFG_OVERLAY_PAGE_SECONDS, OVERLAY_PAGE_SECONDS), 1)
+        self.overlay_pages_source = None
 
     def save_config(self):
         """Save configuration"""
         config.set(CFG_CARRIER_NAME, self.carrier_name)
         config.set(CFG_OVERLAY_ENABLED, self.overlay_enabled)
+        config.set(CFG_FLEET_CARRIERS, ", ".join(self.fleet_carriers))
+        config.set(CFG_ALERT_RULES, self.alert_engine.rules_text)
+        config.set(CFG_ALERT_WEBHOOK, self.alert_webhook)
+        config.set(CFG_OVERLAY_X, str(self.overlay_layout.x))
+        config.set(CFG_OVERLAY_Y, str(self.overlay_layout.y))
+        config.set(CFG_OVERLAY_CHAR_WIDTH, str(self.overlay_layout.char_width))
+        config.set(CFG_OVERLAY_LINE_HEIGHT, str(self.overlay_layout.line_height))
+        config.set(CFG_OVERLAY_MAX_ROWS, str(self.overlay_layout.max_rows))
+        config.set(CFG_OVERLAY_PAGE_SECONDS, str(self.overlay_page_seconds))
+    
+    def tracked_carriers(self):
+        """Primary carrier followed by any additional fleet carriers"""
+        carriers = [self.carrier_name] if self.carrier_name else []
+        for name in self.fleet_carriers:
+            if name not in carriers:
+                carriers.append(name)
+        return carriers
+    
+    def apply_fleet_snapshots(self, snapshots):
+        """Feed per-carrier snapshots into the fleet index and alert rules (main thread)"""
+        tracked = self.tracked_carriers()
+        for key in list(self.fleet_index.carriers):
+            if key not in tracked:
+                self.fleet_index.remove_carrier(key)
+        for key in list(self.alert_engine.previous):
+            if key not in tracked:
+                self.alert_engine.forget(key)
+        
+        alerts = []
+        for key, snapshot in snapshots:
+            if key in tracked:
+                self.fleet_index.update_carrier(key, snapshot)
+                alerts.extend(self.alert_engine.evaluate(key, self.fleet_index.label(key), snapshot))
+        return alerts
+    
+    def fleet_lines(self, limit=None):
+        """Format fleet demand and carrier ranking as fixed-width lines"""
+        lines = []
+        summary = self.fleet_index.commodity_summary()
+        if limit is not None:
+            summary = summary[:limit]
+        for commodity, total, price, best in summary:
+            lines.append(f"{commodity.upper():<25} | {total:>10,} t best {price:>10,} CR @ {best}")
+        
+        ranking = self.fleet_index.ranking()
+        if limit is not None:
+            ranking = ranking[:limit]
+        if ranking:
+            lines.append("CARRIERS BY VALUE/TON: " + ", ".join(
+                f"{label} {value:,} CR" for label, value, tons in ranking
+            ))
+        return lines
     
     def toggle_overlay(self):
         """Toggle overlay on/off"""
@@ -108,6 +1166,7 @@ class EDHauler(object):
         
         if self.overlay_enabled:
             self.update_overlay()
+            self.trips_key = None
             if self.overlay_button:
                 self.overlay_button.config(text="Hide Overlay")
         else:
@@ -117,6 +1176,9 @@ class EDHauler(object):
     
     def clear_overlay(self):
         """Clear all overlay messages"""
+        self.stop_overlay_rotation()
+        self.overlay_sent = {}
+        
         if not OVERLAY_AVAILABLE or not self.overlay_client:
             return
         
@@ -125,11 +1187,45 @@ class EDHauler(object):
             self.overlay_client.send_shape("edhauler_bg", "rect", "#000000", "#000000", 0, 0, 1, 1, ttl=1)
             
             # Clear all EDHauler overlay messages
-            for i in range(20):  # Clear up to 20 lines
+            for i in range(OVERLAY_MAX_SLOTS):
                 self.overlay_client.send_message(f"edhauler_{i}", "", "green", 0, 0, ttl=1)
+            self.overlay_client.send_message("edhauler_trips", "", "green", 0, 0, ttl=1)
+            self.overlay_client.send_message("edhauler_alert", "", "green", 0, 0, ttl=1)
         except Exception as e:
             print(f"EDHauler: Error clearing overlay: {e}")
     
+    def build_overlay_pages(self):
+        """Format the current snapshot into overlay pages (once per snapshot)"""
+        # Header
+        carrier_info = self.market_data.get("carrier_info", {})
+        carrier_text = f"{carrier_info.get('name', 'Unknown')} ({carrier_info.get('callsign', 'Unknown')})"
+        header = [(f"=== {carrier_text} ===", "large"), ("", "normal")]
+        
+        orders = self.market_data.get("orders", [])
+        buy_orders = [o for o in orders if o.get("orderType") == 1]
+        sell_orders = [o for o in orders if o.get("orderType") == 2]
+        
+        def order_lines(order_list):
+            lines = []
+            for order in order_list:
+                commodity = order.get("commodityName", "Unknown").upper()  # Uppercase for emphasis
+                quantity = order.get("stock", 0)
+                price = order.get("price", 0)
+                # Format as table with fixed-width columns
+                # Commodity: 25 chars, Quantity: 10 chars (right-aligned), Price: 10 chars (right-aligned)
+                lines.append(f"{commodity:<25} | {quantity:>10,} @ {price:>10,} CR" + format_order_columns(order))
+            return lines
+        
+        if not orders:
+            return self.overlay_layout.paginate(header, [("MARKET", ["No active market orders"])])
+        
+        sections = [("BUY ORDERS", order_lines(buy_orders))]
+        if self.fleet_carriers and self.fleet_index.totals:
+            sections.append(("FLEET DEMAND", self.fleet_lines(limit=3)))  # Top 3 commodities and carriers
+        sections.append(("SELL ORDERS", order_lines(sell_orders)))
+        
+        return self.overlay_layout.paginate(header, sections)
+    
     def update_overlay(self):
         """Update the overlay with current market data"""
         if not self.overlay_enabled or not OVERLAY_AVAILABLE or not self.overlay_client:
@@ -140,111 +1236,93 @@ class EDHauler(object):
             return
         
         try:
-            # Format overlay text
-            lines = []
-            line_sizes = []  # Track which lines should be larger
-            
-            # Header
-            carrier_info = self.market_data.get("carrier_info", {})
-            carrier_text = f"{carrier_info.get('name', 'Unknown')} ({carrier_info.get('callsign', 'Unknown')})"
-            lines.append(f"=== {carrier_text} ===")
-            line_sizes.append("large")  # Header in large size
-            lines.append("")
-            line_sizes.append("normal")
-            
-            orders = self.market_data.get("orders", [])
-            buy_orders = [o for o in orders if o.get("orderType") == 1]
-            sell_orders = [o for o in orders if o.get("orderType") == 2]
-            
-            if buy_orders:
-                lines.append("BUY ORDERS:")
-                line_sizes.append("large")  # Section header in large
-                for order in buy_orders[:8]:  # Limit to 8 orders for overlay
-                    commodity = order.get("commodityName", "Unknown").upper()  # Uppercase for emphasis
-                    quantity = order.get("stock", 0)
-                    price = order.get("price", 0)
-                    # Format as table with fixed-width columns
-                    # Commodity: 25 chars, Quantity: 10 chars (right-aligned), Price: 10 chars (right-aligned)
-                    lines.append(f"{commodity:<25} | {quantity:>10,} @ {price:>10,} CR")
-                    line_sizes.append("normal")
-                lines.append("")
-                line_sizes.append("normal")
-            
-            if sell_orders:
-                lines.append("SELL ORDERS:")
-                line_sizes.append("large")  # Section header in large
-                for order in sell_orders[:8]:  # Limit to 8 orders for overlay
-                    commodity = order.get("commodityName", "Unknown").upper()  # Uppercase for emphasis
-                    quantity = order.get("stock", 0)
-                    price = order.get("price", 0)
-                    # Format as table with fixed-width columns
-                    # Commodity: 25 chars, Quantity: 10 chars (right-aligned), Price: 10 chars (right-aligned)
-                    lines.append(f"{commodity:<25} | {quantity:>10,} @ {price:>10,} CR")
-                    line_sizes.append("normal")
-            
-            # Calculate background box dimensions
-            # Approximate: 8px per character width, 20px line height
-            max_line_length = max(len(line) for line in lines) if lines else 0
-            box_width = max(max_line_length * 8, 300)  # Minimum 300px width
-            box_height = len(lines) * 20 + 20  # 20px per line + padding
-            
-            # Draw background box with 50% transparency
-            # Fill format: "rgba(0,0,0,0.5)" for black with 50% opacity
+            if self.overlay_pages_source is not self.market_data:
+                self.overlay_pages = self.build_overlay_pages()
+                self.overlay_pages_source = self.market_data
+                self.overlay_page %= len(self.overlay_pages)
+            self.send_overlay_page()
+        except Exception as e:
+            print(f"EDHauler: Error updating overlay: {e}")
+        
+        if len(self.overlay_pages) > 1 and not self.overlay_page_timer and self.parent:
+            self.overlay_page_timer = self.parent.after(self.overlay_page_seconds * 1000, self.rotate_overlay_page)
+    
+    def rotate_overlay_page(self):
+        """Show the next overlay page and schedule the one after"""
+        self.overlay_page_timer = None
+        if len(self.overlay_pages) < 2:
+            return
+        self.overlay_page = (self.overlay_page + 1) % len(self.overlay_pages)
+        self.update_overlay()
+    
+    def stop_overlay_rotation(self):
+        """Cancel the page rotation timer"""
+        if self.overlay_page_timer and self.parent:
+            self.parent.after_cancel(self.overlay_page_timer)
+        self.overlay_page_timer = None
+    
+    def overlay_slot_current(self, overlay_id, payload, now=None):
+        """True if the overlay already shows this payload and it is not close to expiring"""
+        now = time.time() if now is None else now
+        sent = self.overlay_sent.get(overlay_id)
+        if sent is None or sent[0] != payload:
+            return False
+        return payload is None or now - sent[1] < OVERLAY_TTL / 2
+    
+    def send_overlay_page(self):
+        """
+        Send the current page, skipping slots that already show the same text.
+        
+        Unchanged slots are only resent when half their TTL has passed, so
+        rotating between pages costs one message per differing line.
+        """
+        page = self.overlay_pages[self.overlay_page]
+        now = time.time()
+        
+        # Draw background box with 50% transparency
+        # Fill format: "rgba(0,0,0,0.5)" for black with 50% opacity
+        if not self.overlay_slot_current("edhauler_bg", page["box"], now):
             try:
                 self.overlay_client.send_shape(
                     "edhauler_bg",
                     "rect",
                     "#000000",  # Black border
                     "rgba(0,0,0,0.5)",  # Black fill with 50% transparency
-                    OVERLAY_X - 10,  # Slightly left of text
-                    OVERLAY_Y - 10,  # Slightly above text
-                    box_width,
-                    box_height,
-                    ttl=60
+                    *page["box"],
+                    ttl=OVERLAY_TTL
                 )
+                self.overlay_sent["edhauler_bg"] = (page["box"], now)
             except Exception as e:
                 print(f"EDHauler: Could not draw background box: {e}")
-            
-            # Send text to overlay
-            y_offset = OVERLAY_Y
-            for i, (line, size) in enumerate(zip(lines, line_sizes)):
-                if i < 20:  # Limit total lines
-                    self.overlay_client.send_message(
-                        f"edhauler_{i}",
-                        line,
-                        "yellow",
-                        OVERLAY_X,
-                        y_offset,
-                        ttl=60,  # 60 second TTL
-                        size=size
-                    )
-                    # Adjust spacing based on size
-                    y_offset += 24 if size == "large" else 20
-            
-            # Clear any remaining old lines
-            for i in range(len(lines), 20):
-                self.overlay_client.send_message(f"edhauler_{i}", "", "yellow", 0, 0, ttl=1)
-                
-        except Exception as e:
-            print(f"EDHauler: Error updating overlay: {e}")
+        
+        for i in range(OVERLAY_MAX_SLOTS):
+            overlay_id = f"edhauler_{i}"
+            payload = page["slots"][i] if i < len(page["slots"]) else None
+            if self.overlay_slot_current(overlay_id, payload, now):
+                continue
+            if payload is None:
+                # Clear a line left over from a longer page
+                self.overlay_client.send_message(overlay_id, "", "yellow", 0, 0, ttl=1)
+            else:
+                text, size, x, y = payload
+                self.overlay_client.send_message(overlay_id, text, "yellow", x, y, ttl=OVERLAY_TTL, size=size)
+            self.overlay_sent[overlay_id] = (payload, now)
 
-    def fetch_market_data(self):
+    def fetch_market_data(self, carrier_name=None):
         """Fetch market data from INARA public page"""
-        if not self.carrier_name:
-            return {"error": "Carrier Name/ID is required"}
+        if carrier_name is None:
+            carrier_name = self.carrier_name
         
-        if self.is_fetching:
-            return {"error": "Already fetching data"}
-        
-        self.is_fetching = True
+        if not carrier_name:
+            return {"error": "Carrier Name/ID is required"}
         
         try:
             carrier_info = {"name": "", "callsign": ""}
             
             # Check if input is a station ID (all digits)
-            if self.carrier_name.strip().isdigit():
+            if carrier_name.strip().isdigit():
                 # Direct access using station ID
-                station_id = self.carrier_name.strip()
+                station_id = carrier_name.strip()
                 
                 # Fetch the market page directly
                 market_url = f"{INARA_BASE_URL}/elite/station-market/{station_id}/"
@@ -287,7 +1365,7 @@ class EDHauler(object):
                 
             else:
                 # Step 1: Search for the carrier to get its station ID
-                search_url = f"{INARA_BASE_URL}/elite/station/?search={quote(self.carrier_name)}"
+                search_url = f"{INARA_BASE_URL}/elite/station/?search={quote(carrier_name)}"
                 
                 request = Request(
                     search_url,
@@ -300,13 +1378,12 @@ class EDHauler(object):
                 # Extract station ID from the market link
                 market_link_match = re.search(r'/elite/station-market/(\d+)/', html_content)
                 if not market_link_match:
-                    self.is_fetching = False
                     return {"error": "Carrier found but no market link available. Market may be disabled."}
                 
                 station_id = market_link_match.group(1)
                 
                 # Extract carrier info
-                carrier_info = {"name": self.carrier_name, "callsign": ""}
+                carrier_info = {"name": carrier_name, "callsign": ""}
                 # Match either XXX-XXX format OR 3-5 letter/digit format (e.g., CREA)
                 callsign_match = re.search(r'([A-Z0-9]{3}-[A-Z0-9]{3}|[A-Z0-9]{3,5})', html_content)
                 if callsign_match:
@@ -323,72 +1400,34 @@ class EDHauler(object):
                 response = urlopen(request, timeout=15)
                 market_html = response.read().decode('utf-8')
             
-            self.is_fetching = False
-            
             # Parse market data from the market page
-            orders = []
-            
-            # INARA market table structure:
-            # Column 1: Commodity name
-            # Column 2: Sell price (station buying FROM players) - if not "-" it's a BUY order
-            # Column 3: Demand (quantity for buy orders)
-            # Column 4: Buy price (station selling TO players) - if not "-" it's a SELL order
-            # Column 5: Supply (quantity for sell orders)
+            rows, parse_status, saved_page = self.market_parser.parse(market_html, carrier_name)
+            orders = orders_from_rows(rows)
             
-            # Find all table rows with commodity data
-            # Pattern matches: commodity link, then captures all 4 price/quantity columns
-            row_pattern = r'<tr[^>]*>.*?href="/elite/commodity/\d+/">([^<]+)</a>.*?' + \
-                         r'<td[^>]*data-order="(\d+)"[^>]*>.*?</td>.*?' + \
-                         r'<td[^>]*data-order="(\d+)"[^>]*>.*?</td>.*?' + \
-                         r'<td[^>]*data-order="(\d+)"[^>]*>.*?</td>.*?' + \
-                         r'<td[^>]*data-order="(\d+)"[^>]*>.*?</td>.*?</tr>'
+            if parse_status == "failed":
+                error = "Could not read INARA market page (layout changed?)."
+                if saved_page:
+                    error += f" Page saved to EDHauler diagnostics folder ({os.path.basename(saved_page)})."
+                return {"error": error}
             
-            matches = re.findall(row_pattern, market_html, re.DOTALL | re.IGNORECASE)
-            
-            for match in matches:
-                commodity_name = match[0].strip()
-                sell_price = int(match[1])      # Station buying (players sell)
-                demand = int(match[2])          # Demand quantity
-                buy_price = int(match[3])       # Station selling (players buy)
-                supply = int(match[4])          # Supply quantity
-                
-                # If sell_price > 0 and not 99999999999 (that's the subheader), it's a BUY order
-                if sell_price > 0 and sell_price < 99999999999 and demand > 0:
-                    orders.append({
-                        "commodityName": commodity_name,
-                        "orderType": 1,  # Buy order (carrier buying from players)
-                        "stock": demand,
-                        "price": sell_price
-                    })
-                
-                # If buy_price > 0 and not 99999999999, it's a SELL order
-                if buy_price > 0 and buy_price < 99999999999 and supply > 0:
-                    orders.append({
-                        "commodityName": commodity_name,
-                        "orderType": 2,  # Sell order (carrier selling to players)
-                        "stock": supply,
-                        "price": buy_price
-                    })
-            
-            if not orders:
-                return {"error": "Market page found but no active orders. Carrier may have empty market."}
-            
-            return {
+            # A readable page without orders is a real (empty) market, not an error,
+            # so filled orders drop out of the fleet index and alert rules
+            result = {
                 "success": True,
                 "orders": orders,
                 "carrier_info": carrier_info
             }
+            if parse_status == "fallback":
+                result["parser_warning"] = "INARA layout changed, using fallback parser"
+            return result
             
         except HTTPError as e:
-            self.is_fetching = False
             if e.code == 404:
-                return {"error": f"Carrier '{self.carrier_name}' not found on INARA"}
+                return {"error": f"Carrier '{carrier_name}' not found on INARA"}
             return {"error": f"HTTP Error {e.code}: {e.reason}"}
         except URLError as e:
-            self.is_fetching = False
             return {"error": f"Network Error: {str(e.reason)}"}
         except Exception as e:
-            self.is_fetching = False
             return {"error": f"Error: {str(e)}"}
 
     def update_display(self):
@@ -397,9 +1436,14 @@ class EDHauler(object):
         if self.overlay_enabled:
             self.update_overlay()
         
+        # New snapshot: trips remaining are redrawn on the next local tick
+        self.trips_key = None
+        
         if not self.market_frame or not self.status_label:
             return
         
+        self.update_fleet_display()
+        
         # Clear existing market labels
         for label in self.market_labels:
             label.destroy()
@@ -414,6 +1458,7 @@ class EDHauler(object):
             )
             label.pack(anchor=tk.W)
             self.market_labels.append(label)
+            self.hide_market_view()
             self.status_label.config(text="Status: No data")
             return
         
@@ -427,6 +1472,7 @@ class EDHauler(object):
             )
             label.pack(anchor=tk.W)
             self.market_labels.append(label)
+            self.hide_market_view()
             self.status_label.config(text="Status: Error")
             return
         
@@ -443,92 +1489,310 @@ class EDHauler(object):
         
         # Display market orders
         orders = self.market_data.get("orders", [])
+        self.market_index = MarketIndex(orders)
         
         if not orders:
             label = tk.Label(
                 self.market_frame,
-                text="No active market orders",
+                text="No active market orders. Carrier may have empty market.",
                 justify=tk.LEFT
             )
             label.pack(anchor=tk.W)
             self.market_labels.append(label)
+            self.hide_market_view()
         else:
-            # Sort orders by type (buy first, then sell)
-            buy_orders = [o for o in orders if o.get("orderType") == 1]
-            sell_orders = [o for o in orders if o.get("orderType") == 2]
-            
-            if buy_orders:
-                header = tk.Label(
-                    self.market_frame,
-                    text="=== BUY ORDERS ===",
-                    justify=tk.LEFT,
-                    font=("TkDefaultFont", 9, "bold")
-                )
-                header.pack(anchor=tk.W)
-                self.market_labels.append(header)
-                
-                for order in buy_orders[:10]:  # Limit to 10 orders
-                    commodity = order.get("commodityName", "Unknown")
-                    quantity = order.get("stock", 0)
-                    price = order.get("price", 0)
-                    
-                    order_text = f"  BUY {commodity}: {quantity:,} @ {price:,} CR"
-                    label = tk.Label(
-                        self.market_frame,
-                        text=order_text,
-                        justify=tk.LEFT,
-                        fg="green"
-                    )
-                    label.pack(anchor=tk.W)
-                    self.market_labels.append(label)
-            
-            if sell_orders:
-                header = tk.Label(
-                    self.market_frame,
-                    text="=== SELL ORDERS ===",
-                    justify=tk.LEFT,
-                    font=("TkDefaultFont", 9, "bold")
-                )
-                header.pack(anchor=tk.W)
-                self.market_labels.append(header)
-                
-                for order in sell_orders[:10]:  # Limit to 10 orders
-                    commodity = order.get("commodityName", "Unknown")
-                    quantity = order.get("stock", 0)
-                    price = order.get("price", 0)
-                    
-                    order_text = f"  SELL {commodity}: {quantity:,} @ {price:,} CR"
-                    label = tk.Label(
-                        self.market_frame,
-                        text=order_text,
-                        justify=tk.LEFT,
-                        fg="blue"
-                    )
-                    label.pack(anchor=tk.W)
-                    self.market_labels.append(label)
+            self.show_market_view()
         
         # Update status with last update time
         if self.last_update:
             time_str = self.last_update.strftime("%H:%M:%S")
-            self.status_label.config(text=f"Last updated: {time_str}")
+            notes = []
+            if self.market_data.get("parser_warning"):
+                notes.append(self.market_data["parser_warning"])
+            if self.alert_engine.errors:
+                # Stays visible on every refresh until the rule is fixed in settings
+                notes.append(self.alert_engine.errors[0])
+            if notes:
+                self.status_label.config(text=f"Last updated: {time_str} ({'; '.join(notes)})")
+            else:
+                self.status_label.config(text=f"Last updated: {time_str}")
         else:
             self.status_label.config(text="Status: Ready")
 
+    def build_market_view(self):
+        """Create the filter box and scrollable order list inside the market frame"""
+        self.market_view = tk.Frame(self.market_frame)
+        
+        filter_frame = tk.Frame(self.market_view)
+        filter_frame.pack(fill=tk.X)
+        tk.Label(filter_frame, text="Filter:").pack(side=tk.LEFT)
+        self.market_filter_var = tk.StringVar()
+        self.market_filter_var.trace_add("write", lambda *args: self.render_market_view())
+        tk.Entry(filter_frame, textvariable=self.market_filter_var, width=20).pack(side=tk.LEFT, padx=2)
+        
+        tree_frame = tk.Frame(self.market_view)
+        tree_frame.pack(fill=tk.BOTH, expand=True)
+        self.market_tree = ttk.Treeview(
+            tree_frame,
+            columns=[column for column, heading, width, anchor in MARKET_COLUMNS],
+            show="headings",
+            height=MARKET_VISIBLE_ROWS,
+            selectmode="browse"
+        )
+        for column, heading, width, anchor in MARKET_COLUMNS:
+            self.market_tree.heading(column, text=heading, command=lambda c=column: self.sort_market_view(c))
+            self.market_tree.column(column, width=width, anchor=anchor, stretch=False)
+        self.market_tree.tag_configure("buy", foreground="green")
+        self.market_tree.tag_configure("sell", foreground="blue")
+        
+        scrollbar = ttk.Scrollbar(tree_frame, orient=tk.VERTICAL, command=self.market_tree.yview)
+        self.market_tree.configure(yscrollcommand=scrollbar.set)
+        self.market_tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.update_sort_headings()
+
+    def show_market_view(self):
+        """Show the order list and render the current snapshot into it"""
+        if not self.market_view:
+            return
+        if not self.market_view.winfo_manager():
+            self.market_view.pack(anchor=tk.W, fill=tk.X)
+        self.render_market_view()
+
+    def hide_market_view(self):
+        """Hide the order list while an error or empty market is shown"""
+        if self.market_view:
+            self.market_view.pack_forget()
+
+    def sort_market_view(self, column):
+        """Sort by a column; clicking the same column again reverses the order"""
+        if self.market_sort[0] == column:
+            self.market_sort = (column, not self.market_sort[1])
+        else:
+            # Numbers read best largest first, names alphabetically
+            self.market_sort = (column, column not in ("type", "commodity"))
+        self.update_sort_headings()
+        self.render_market_view()
+
+    def update_sort_headings(self):
+        """Mark the sorted column heading with its direction"""
+        if not self.market_tree:
+            return
+        sort_column, descending = self.market_sort
+        for column, heading, width, anchor in MARKET_COLUMNS:
+            if column == sort_column:
+                heading += " \u25bc" if descending else " \u25b2"
+            self.market_tree.heading(column, text=heading)
+
+    def render_market_view(self):
+        """
+        Sync the tree with the current index view.
+        
+        Rows are keyed by order type and commodity, so a refresh only updates
+        rows whose values changed and moves rows whose position changed.
+        """
+        if not self.market_tree:
+            return
+        
+        tree = self.market_tree
+        text = self.market_filter_var.get() if self.market_filter_var else ""
+        rows = self.market_index.view(self.market_sort[0], self.market_sort[1], text)
+        wanted = [row["iid"] for row in rows]
+        wanted_set = set(wanted)
+        
+        for iid in tree.get_children():
+            if iid not in wanted_set:
+                tree.delete(iid)
+                self.market_rendered.pop(iid, None)
+        
+        for row in rows:
+            iid = row["iid"]
+            if iid not in self.market_rendered:
+                tree.insert("", tk.END, iid=iid, values=row["values"], tags=(row["kind"].lower(),))
+            elif self.market_rendered[iid] != row["values"]:
+                tree.item(iid, values=row["values"])
+            self.market_rendered[iid] = row["values"]
+        
+        if list(tree.get_children()) != wanted:
+            for index, iid in enumerate(wanted):
+                tree.move(iid, "", index)
+
+    def update_fleet_display(self):
+        """Update the fleet-wide demand summary"""
+        if not self.fleet_frame:
+            return
+        
+        for label in self.fleet_labels:
+            label.destroy()
+        self.fleet_labels = []
+        
+        if not self.fleet_carriers or not self.fleet_index.totals:
+            return
+        
+        header = tk.Label(
+            self.fleet_frame,
+            text=f"=== FLEET DEMAND ({len(self.fleet_index.carriers)} carriers) ===",
+            justify=tk.LEFT,
+            font=("TkDefaultFont", 9, "bold")
+        )
+        header.pack(anchor=tk.W)
+        self.fleet_labels.append(header)
+        
+        for commodity, total, price, best in self.fleet_index.commodity_summary()[:10]:  # Limit to 10 commodities
+            label = tk.Label(
+                self.fleet_frame,
+                text=f"  {commodity}: {total:,} t, best {price:,} CR @ {best}",
+                justify=tk.LEFT,
+                fg="green"
+            )
+            label.pack(anchor=tk.W)
+            self.fleet_labels.append(label)
+        
+        ranking = self.fleet_index.ranking()
+        if ranking:
+            label = tk.Label(
+                self.fleet_frame,
+                text="  Best paying: " + ", ".join(f"{name} ({value:,} CR/t)" for name, value, tons in ranking[:5]),
+                justify=tk.LEFT
+            )
+            label.pack(anchor=tk.W)
+            self.fleet_labels.append(label)
+
     def fetch_and_update(self):
         """Fetch data and update display (non-blocking)"""
-        def fetch_thread():
+        # One fetch cycle (every carrier plus reference prices) at a time
+        if self.is_fetching:
+            return
+        self.is_fetching = True
+        
+        def fetch_cycle():
             result = self.fetch_market_data()
-            self.market_data = result
-            self.last_update = datetime.now()
+            fetched_at = datetime.now()
+            
+            # Fetch the rest of the fleet in the same background thread
+            snapshots = [(self.carrier_name, result)]
+            for name in self.fleet_carriers:
+                if name != self.carrier_name:
+                    snapshots.append((name, self.fetch_market_data(name)))
+            
+            # Profit columns use cached reference prices only, so a cold cache
+            # never holds back the market display
+            commodity_ids = market_commodity_ids(result)
+            try:
+                reference_prices, missing = self.price_cache.lookup(commodity_ids)
+            except Exception as e:
+                print(f"EDHauler: Could not look up reference prices: {e}")
+                reference_prices, missing = {}, []
+            for key, snapshot in snapshots:
+                annotate_orders(snapshot, reference_prices)
             
-            # Schedule UI update on main thread
+            # Publish the finished snapshots on the main thread
             if self.parent:
-                self.parent.after(0, self.update_display)
+                self.parent.after(0, lambda: self.on_fetch_complete(result, fetched_at, snapshots))
+            
+            # Fetch cold prices afterwards; the columns fill in when they arrive
+            if missing:
+                self.start_price_lookup(missing)
+        
+        def fetch_thread():
+            try:
+                fetch_cycle()
+            finally:
+                self.is_fetching = False
         
         thread = Thread(target=fetch_thread)
         thread.daemon = True
         thread.start()
 
+    def start_price_lookup(self, commodity_ids):
+        """Fetch missing reference prices in the background (one batch at a time)"""
+        if self.is_pricing:
+            return
+        self.is_pricing = True
+        
+        def price_thread():
+            try:
+                self.price_cache.get_many(commodity_ids)
+            except Exception as e:
+                # Reference prices are optional: lose the profit columns, not the refresh
+                print(f"EDHauler: Could not look up reference prices: {e}")
+            finally:
+                self.is_pricing = False
+            if self.parent:
+                self.parent.after(0, self.on_prices_ready)
+        
+        thread = Thread(target=price_thread)
+        thread.daemon = True
+        thread.start()
+
+    def on_prices_ready(self):
+        """Annotate the current snapshot with newly cached prices and redraw (main thread)"""
+        commodity_ids = market_commodity_ids(self.market_data)
+        if not commodity_ids:
+            return
+        reference_prices, missing = self.price_cache.lookup(commodity_ids)
+        annotate_orders(self.market_data, reference_prices)
+        self.overlay_pages_source = None  # Pages were built without these columns
+        self.update_display()
+
+    def on_fetch_complete(self, result, fetched_at, snapshots):
+        """Publish a finished fetch cycle, update the fleet index and redraw"""
+        self.market_data = result
+        self.last_update = fetched_at
+        alerts = self.apply_fleet_snapshots(snapshots)
+        self.update_display()
+        if alerts:
+            self.show_alerts(alerts)
+
+    def show_alerts(self, alerts):
+        """Send alerts to the status label, the overlay and the optional webhook"""
+        for message in alerts:
+            print(f"EDHauler: Alert: {message}")
+        
+        summary = alerts[0] if len(alerts) == 1 else f"{alerts[0]} (+{len(alerts) - 1} more)"
+        if self.status_label:
+            self.status_label.config(text=f"ALERT: {summary}")
+        
+        if self.overlay_enabled and OVERLAY_AVAILABLE and self.overlay_client:
+            try:
+                self.overlay_client.send_message(
+                    "edhauler_alert",
+                    f"ALERT: {summary}",
+                    "red",
+                    self.overlay_layout.x,
+                    self.overlay_layout.y - 60,
+                    ttl=ALERT_OVERLAY_SECONDS,
+                    size="large"
+                )
+            except Exception as e:
+                print(f"EDHauler: Error showing alert on overlay: {e}")
+        
+        if self.alert_webhook:
+            thread = Thread(target=self.post_alert_webhook, args=(self.alert_webhook, list(alerts)))
+            thread.daemon = True
+            thread.start()
+
+    def post_alert_webhook(self, url, alerts):
+        """POST alerts as JSON to a webhook on this machine (background thread)"""
+        if urlparse(url).hostname not in ALERT_WEBHOOK_HOSTS:
+            print(f"EDHauler: Alert webhook must be on localhost, not sending to {url}")
+            return
+        
+        try:
+            payload = {
+                "source": "EDHauler",
+                "timestamp": datetime.now().isoformat(timespec="seconds"),
+                "alerts": alerts
+            }
+            request = Request(
+                url,
+                data=json.dumps(payload).encode("utf-8"),
+                headers={'User-Agent': 'EDHauler/1.0 (EDMC Plugin)', 'Content-Type': 'application/json'}
+            )
+            urlopen(request, timeout=5).close()
+        except Exception as e:
+            print(f"EDHauler: Could not post alert webhook: {e}")
+
     def manual_refresh(self):
         """Handle manual refresh button click"""
         self.fetch_and_update()
@@ -565,7 +1829,7 @@ class EDHauler(object):
                     commodity = order.get("commodityName", "Unknown").upper()
                     quantity = order.get("stock", 0)
                     price = order.get("price", 0)
-                    lines.append(f"{commodity:<25} | {quantity:>10,} @ {price:>10,} CR")
+                    lines.append(f"{commodity:<25} | {quantity:>10,} @ {price:>10,} CR" + format_order_columns(order))
                 lines.append("")
             
             if sell_orders:
@@ -574,7 +1838,12 @@ class EDHauler(object):
                     commodity = order.get("commodityName", "Unknown").upper()
                     quantity = order.get("stock", 0)
                     price = order.get("price", 0)
-                    lines.append(f"{commodity:<25} | {quantity:>10,} @ {price:>10,} CR")
+                    lines.append(f"{commodity:<25} | {quantity:>10,} @ {price:>10,} CR" + format_order_columns(order))
+            
+            if self.fleet_carriers and self.fleet_index.totals:
+                lines.append("")
+                lines.append("FLEET DEMAND:")
+                lines.extend(self.fleet_lines())
             
             # Join lines and copy to clipboard
             text = "\n".join(lines)
@@ -604,10 +1873,66 @@ class EDHauler(object):
             self.refresh_timer = self.parent.after(30000, self.schedule_refresh)
 
     def stop_refresh(self):
-        """Stop automatic refresh timer"""
+        """Stop automatic refresh timers"""
         if self.refresh_timer and self.parent:
             self.parent.after_cancel(self.refresh_timer)
             self.refresh_timer = None
+        if self.trips_timer and self.parent:
+            self.parent.after_cancel(self.trips_timer)
+            self.trips_timer = None
+        self.stop_overlay_rotation()
+
+    def trips_lines(self):
+        """Format trips and time remaining for each buy order"""
+        tracker = self.cargo_tracker
+        if not tracker.capacity or not self.market_data or "error" in self.market_data:
+            return []
+        
+        carried = sum(tracker.cargo.values())
+        lines = [f"Cargo {carried:,}/{tracker.capacity:,} t, ~{format_duration(tracker.trip_minutes())} per trip"]
+        for order in self.market_data.get("orders", []):
+            if order.get("orderType") != 1:
+                continue
+            estimate = tracker.estimate(order)
+            if estimate:
+                trips, minutes = estimate
+                lines.append(f"{order.get('commodityName', 'Unknown')}: {trips:,} trips (~{format_duration(minutes)})")
+        return lines
+
+    def update_trips_display(self):
+        """Refresh trips remaining in the UI and overlay (local data only)"""
+        if self.trips_key != self.cargo_tracker.generation:
+            self.trips_key = self.cargo_tracker.generation
+            self.trips_text = self.trips_lines()
+            if self.trips_label:
+                self.trips_label.config(text="\n".join(self.trips_text))
+        
+        if not self.overlay_enabled or not OVERLAY_AVAILABLE or not self.overlay_client:
+            return
+        try:
+            # Own overlay slot above the market box so it refreshes independently
+            text = " | ".join(self.trips_text[1:4]) if len(self.trips_text) > 1 else ""
+            payload = (f"TRIPS: {text}", self.overlay_layout.x, self.overlay_layout.y - 34) if text else None
+            if self.overlay_slot_current("edhauler_trips", payload):
+                return
+            if payload:
+                self.overlay_client.send_message("edhauler_trips", payload[0], "yellow", payload[1], payload[2], ttl=OVERLAY_TTL)
+            else:
+                self.overlay_client.send_message("edhauler_trips", "", "yellow", 0, 0, ttl=1)
+            self.overlay_sent["edhauler_trips"] = (payload, time.time())
+        except Exception as e:
+            print(f"EDHauler: Error updating trips overlay: {e}")
+
+    def schedule_trips_refresh(self):
+        """Refresh trips remaining on a local timer"""
+        self.update_trips_display()
+        
+        if self.parent:
+            self.trips_timer = self.parent.after(TRIP_REFRESH_MS, self.schedule_trips_refresh)
+
+    def on_journal_entry(self, entry, state):
+        """Track cargo capacity, hold contents and deliveries"""
+        self.cargo_tracker.on_journal_entry(entry, state)
 
 
 def plugin_start3(plugin_dir):
@@ -619,6 +1944,7 @@ def plugin_start(plugin_dir):
     """Initialize plugin"""
     hauler = EDHauler()
     hauler.load_config()
+    hauler.market_parser.diagnostics_dir = os.path.join(plugin_dir, DIAGNOSTICS_DIR)
     this.hauler = hauler
     return "EDHauler"
 
@@ -629,6 +1955,12 @@ def plugin_stop():
         this.hauler.stop_refresh()
 
 
+def journal_entry(cmdr, is_beta, system, station, entry, state):
+    """Handle journal events for cargo tracking"""
+    if hasattr(this, 'hauler') and this.hauler:
+        this.hauler.on_journal_entry(entry, state)
+
+
 def plugin_app(parent):
     """Create UI for EDMC main window"""
     if not hasattr(this, 'hauler'):
@@ -696,12 +2028,27 @@ def plugin_app(parent):
         )
         hauler.overlay_button.pack(side=tk.LEFT, padx=2)
     
-    # Market data frame (scrollable area)
+    # Market data frame (messages plus scrollable order list)
     hauler.market_frame = tk.Frame(frame)
     hauler.market_frame.grid(row=3, column=0, columnspan=2, sticky=tk.W, padx=5)
+    hauler.build_market_view()
+    
+    # Fleet-wide demand summary (only populated when fleet carriers are configured)
+    hauler.fleet_frame = tk.Frame(frame)
+    hauler.fleet_frame.grid(row=4, column=0, columnspan=2, sticky=tk.W, padx=5)
+    
+    # Trips remaining (refreshed locally from journal cargo state)
+    hauler.trips_label = tk.Label(
+        frame,
+        text="",
+        justify=tk.LEFT,
+        fg="gray"
+    )
+    hauler.trips_label.grid(row=5, column=0, columnspan=2, sticky=tk.W, padx=5)
     
     # Start automatic refresh
     hauler.schedule_refresh()
+    hauler.schedule_trips_refresh()
     
     return frame
 
@@ -742,6 +2089,66 @@ def plugin_prefs(parent, cmdr, is_beta):
         carrier_entry = tk.Entry(frame, textvariable=this.carrier_name_var, width=30)
     carrier_entry.grid(row=1, column=1, sticky=tk.EW, padx=10)
     
+    # Additional fleet carriers (comma-separated)
+    if nb:
+        fleet_label = nb.Label(frame, text="Fleet carriers (comma-separated):")
+    else:
+        fleet_label = tk.Label(frame, text="Fleet carriers (comma-separated):")
+    fleet_label.grid(row=2, column=0, sticky=tk.W, padx=10)
+    
+    this.fleet_carriers_var = tk.StringVar(value=", ".join(hauler.fleet_carriers))
+    if nb:
+        fleet_entry = nb.Entry(frame, textvariable=this.fleet_carriers_var, width=30)
+    else:
+        fleet_entry = tk.Entry(frame, textvariable=this.fleet_carriers_var, width=30)
+    fleet_entry.grid(row=2, column=1, sticky=tk.EW, padx=10)
+    
+    # Alert rules (";"-separated) and optional local webhook
+    if nb:
+        alert_label = nb.Label(frame, text="Alert rules (;-separated):")
+    else:
+        alert_label = tk.Label(frame, text="Alert rules (;-separated):")
+    alert_label.grid(row=3, column=0, sticky=tk.W, padx=10)
+    
+    this.alert_rules_var = tk.StringVar(value=hauler.alert_engine.rules_text)
+    if nb:
+        alert_entry = nb.Entry(frame, textvariable=this.alert_rules_var, width=30)
+    else:
+        alert_entry = tk.Entry(frame, textvariable=this.alert_rules_var, width=30)
+    alert_entry.grid(row=3, column=1, sticky=tk.EW, padx=10)
+    
+    # Rule errors, checked as the rules are typed
+    if nb:
+        alert_error_label = nb.Label(frame, text="", foreground="red")
+    else:
+        alert_error_label = tk.Label(frame, text="", foreground="red")
+    alert_error_label.grid(row=4, column=1, sticky=tk.W, padx=10)
+    
+    def check_alert_rules(*args):
+        errors = []
+        for text in this.alert_rules_var.get().split(";"):
+            if text.strip():
+                try:
+                    AlertRule.parse(text)
+                except ValueError as e:
+                    errors.append(str(e))
+        alert_error_label.config(text="\n".join(errors))
+    this.alert_rules_var.trace_add("write", check_alert_rules)
+    check_alert_rules()
+    
+    if nb:
+        webhook_label = nb.Label(frame, text="Alert webhook (localhost URL, optional):")
+    else:
+        webhook_label = tk.Label(frame, text="Alert webhook (localhost URL, optional):")
+    webhook_label.grid(row=5, column=0, sticky=tk.W, padx=10)
+    
+    this.alert_webhook_var = tk.StringVar(value=hauler.alert_webhook)
+    if nb:
+        webhook_entry = nb.Entry(frame, textvariable=this.alert_webhook_var, width=30)
+    else:
+        webhook_entry = tk.Entry(frame, textvariable=this.alert_webhook_var, width=30)
+    webhook_entry.grid(row=5, column=1, sticky=tk.EW, padx=10)
+    
     # Overlay enabled checkbox (only if overlay is available)
     if OVERLAY_AVAILABLE:
         this.overlay_enabled_var = tk.IntVar(value=1 if hauler.overlay_enabled else 0)
@@ -757,20 +2164,45 @@ def plugin_prefs(parent, cmdr, is_beta):
                 text="Enable in-game overlay (yellow text)",
                 variable=this.overlay_enabled_var
             )
-        overlay_check.grid(row=2, column=0, columnspan=2, sticky=tk.W, padx=10, pady=5)
+        overlay_check.grid(row=6, column=0, columnspan=2, sticky=tk.W, padx=10, pady=5)
+        
+        # Overlay layout settings
+        layout = hauler.overlay_layout
+        overlay_settings = [
+            ("x", "Overlay X position (px):", layout.x),
+            ("y", "Overlay Y position (px):", layout.y),
+            ("char_width", "Overlay character width (px):", layout.char_width),
+            ("line_height", "Overlay line height (px):", layout.line_height),
+            ("max_rows", f"Overlay lines per page (max {OVERLAY_MAX_SLOTS}):", layout.max_rows),
+            ("page_seconds", "Overlay seconds per page:", hauler.overlay_page_seconds),
+        ]
+        this.overlay_layout_vars = {}
+        for row, (name, text, value) in enumerate(overlay_settings, start=7):
+            if nb:
+                setting_label = nb.Label(frame, text=text)
+            else:
+                setting_label = tk.Label(frame, text=text)
+            setting_label.grid(row=row, column=0, sticky=tk.W, padx=10)
+            
+            this.overlay_layout_vars[name] = tk.StringVar(value=str(value))
+            if nb:
+                setting_entry = nb.Entry(frame, textvariable=this.overlay_layout_vars[name], width=8)
+            else:
+                setting_entry = tk.Entry(frame, textvariable=this.overlay_layout_vars[name], width=8)
+            setting_entry.grid(row=row, column=1, sticky=tk.W, padx=10)
     
     # Help text
     if nb:
         help_label = nb.Label(
             frame,
-            text="Enter your Fleet Carrier's name, callsign, or INARA station ID.\n• Name/Callsign: 'CREA' or 'Q0G-09K'\n• Station ID: '1063226' (faster, more reliable)\nData is fetched from INARA's public pages - no API key needed!\nUpdates automatically every 30 seconds."
+            text="Enter your Fleet Carrier's name, callsign, or INARA station ID.\n• Name/Callsign: 'CREA' or 'Q0G-09K'\n• Station ID: '1063226' (faster, more reliable)\nFleet carriers are polled too and summed into a fleet-wide demand view.\nAlert rules: 'demand tritium < 1000; new buy; price * 5%'\nData is fetched from INARA's public pages - no API key needed!\nUpdates automatically every 30 seconds."
         )
     else:
         help_label = tk.Label(
             frame,
-            text="Enter your Fleet Carrier's name, callsign, or INARA station ID.\n• Name/Callsign: 'CREA' or 'Q0G-09K'\n• Station ID: '1063226' (faster, more reliable)\nData is fetched from INARA's public pages - no API key needed!\nUpdates automatically every 30 seconds."
+            text="Enter your Fleet Carrier's name, callsign, or INARA station ID.\n• Name/Callsign: 'CREA' or 'Q0G-09K'\n• Station ID: '1063226' (faster, more reliable)\nFleet carriers are polled too and summed into a fleet-wide demand view.\nAlert rules: 'demand tritium < 1000; new buy; price * 5%'\nData is fetched from INARA's public pages - no API key needed!\nUpdates automatically every 30 seconds."
         )
-    help_label.grid(row=3, column=0, columnspan=2, sticky=tk.W, padx=10, pady=10)
+    help_label.grid(row=13, column=0, columnspan=2, sticky=tk.W, padx=10, pady=10)
     
     return frame
 
@@ -785,6 +2217,13 @@ def prefs_changed(cmdr, is_beta):
     # Update configuration
     if hasattr(this, 'carrier_name_var'):
         hauler.carrier_name = this.carrier_name_var.get()
+    if hasattr(this, 'fleet_carriers_var'):
+        hauler.fleet_carriers = parse_carrier_list(this.fleet_carriers_var.get())
+    if hasattr(this, 'alert_rules_var'):
+        if this.alert_rules_var.get() != hauler.alert_engine.rules_text:
+            hauler.alert_engine.compile(this.alert_rules_var.get())
+    if hasattr(this, 'alert_webhook_var'):
+        hauler.alert_webhook = this.alert_webhook_var.get().strip()
     
     # Update overlay setting if available
     if OVERLAY_AVAILABLE and hasattr(this, 'overlay_enabled_var'):
@@ -803,6 +2242,32 @@ def prefs_changed(cmdr, is_beta):
             else:
                 hauler.clear_overlay()
     
+    # Update overlay layout if available
+    if OVERLAY_AVAILABLE and hasattr(this, 'overlay_layout_vars'):
+        layout = hauler.overlay_layout
+        values = {}
+        for name, var in this.overlay_layout_vars.items():
+            try:
+                values[name] = int(var.get())
+            except ValueError:
+                values[name] = getattr(layout, name, hauler.overlay_page_seconds)
+        
+        new_layout = OverlayLayout(
+            x=values["x"],
+            y=values["y"],
+            char_width=values["char_width"],
+            line_height=values["line_height"],
+            max_rows=values["max_rows"]
+        )
+        page_seconds = max(values["page_seconds"], 1)
+        if vars(new_layout) != vars(layout) or page_seconds != hauler.overlay_page_seconds:
+            hauler.overlay_layout = new_layout
+            hauler.overlay_page_seconds = page_seconds
+            hauler.overlay_pages_source = None  # Rebuild pages with the new layout
+            if hauler.overlay_enabled:
+                hauler.clear_overlay()
+                hauler.update_overlay()
+    
     hauler.save_config()
     
     # Update display